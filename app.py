@@ -1,22 +1,56 @@
-import yaml
-from flask import Flask, jsonify, request
+import orjson
+import redis
+from flask import Flask, request
+from flask_caching import Cache
 
 from models.mysql import MySQLConnector
 from services.search_vols import SearchVolumeService
+from utils.config import load_config
 
-with open("config.yml", encoding="utf-8") as f:
-    config = yaml.load(f, Loader=yaml.FullLoader)
+config = load_config()
+
+# Redis client for caching users' merged subscription ranges in the service
+redis_url = config["CACHE"].get("CACHE_REDIS_URL")
+subscription_cache = redis.Redis.from_url(redis_url) if redis_url else None
 
 mysql = MySQLConnector(config["MYSQL_CONNECT"])
-service = SearchVolumeService(mysql)
+service = SearchVolumeService(mysql, cache=subscription_cache)
 app = Flask(__name__)
+cache = Cache(app, config=config["CACHE"])
+
+# Cache time-to-live (seconds) of successful `/query` responses
+QUERY_CACHE_TIMEOUT = 60
+
+
+def json_response(body: dict):
+    """
+    Serializes the response body to JSON with orjson.
+
+    Parameters:
+        body (dict): The response body.
+
+    Returns:
+        Response: The JSON response.
+    """
+    return app.response_class(
+        orjson.dumps(body, option=orjson.OPT_SORT_KEYS),
+        mimetype="application/json",
+    )
 
 
 @app.route("/query", methods=["GET"])
+@cache.cached(
+    timeout=QUERY_CACHE_TIMEOUT,
+    query_string=True,
+    response_filter=lambda rv: rv[1] == 200,
+)
 def search_volume():
     """
     API endpoint to execute search volume queries.
 
+    Successful responses are cached per query string, so identical requests are
+    served without hitting MySQL until the cache entry expires.
+
     Returns:
         JSON response with success/error message and HTTP status code.
     """
@@ -25,7 +59,7 @@ def search_volume():
 
     if status_code == 200:
         return (
-            jsonify(
+            json_response(
                 {
                     "success": True,
                     "message": "Query executed successfully",
@@ -37,21 +71,21 @@ def search_volume():
 
     elif status_code == 400:
         return (
-            jsonify(
+            json_response(
                 {"success": False, "message": "Validation failed", "errors": result}
             ),
             400,
         )
     elif status_code == 403:
         return (
-            jsonify(
+            json_response(
                 {"success": False, "message": "Unauthorized Users", "errors": result}
             ),
             400,
         )
     else:
         return (
-            jsonify(
+            json_response(
                 {
                     "success": False,
                     "message": "Internal Server Error",
@@ -3,9 +3,11 @@ import random
 import loguru
 import numpy as np
 import pandas as pd
-import yaml
+import redis
 
 from models.mysql import MySQLConnector
+from services.search_vols import SearchVolumeService
+from utils.config import load_config
 
 MAX_KEYWORDS = 10
 
@@ -53,19 +55,21 @@ def generate_sample_search_vols_data(df_keywords: pd.DataFrame) -> tuple:
     end_date = "2025-03-31 23:00:00"
     timestamps = pd.date_range(start=start_date, end=end_date, freq="H")
 
-    data = []
-    for keyword_id in df_keywords["keyword_id"]:
-        for ts in timestamps:
-            # Random search volume between 100 and 5000
-            search_volume = np.random.randint(100, 5000)
-            data.append(
-                {
-                    "keyword_id": keyword_id,
-                    "created_datetime": ts,
-                    "search_volume": search_volume,
-                }
-            )
-    df_keyword_search_volume = pd.DataFrame(data)
+    # Build the (keyword_id, created_datetime) grid column-wise instead of row by row
+    n_timestamps = len(timestamps)
+    keyword_ids = np.repeat(df_keywords["keyword_id"].values, n_timestamps)
+    created_datetimes = np.tile(timestamps.values, len(df_keywords))
+
+    # Random search volume between 100 and 5000
+    search_volumes = np.random.randint(100, 5000, size=keyword_ids.size)
+
+    df_keyword_search_volume = pd.DataFrame(
+        {
+            "keyword_id": keyword_ids,
+            "created_datetime": created_datetimes,
+            "search_volume": search_volumes,
+        }
+    )
 
     # Create noise for case "if 9:00AM data is not available".
     # Step 1: Randomly select 3 keywords and 10 days to create exception.
@@ -80,10 +84,13 @@ def generate_sample_search_vols_data(df_keywords: pd.DataFrame) -> tuple:
             remove_data = ts.replace(hour=i)
             total_exception_ts.append(remove_data)
 
-    df_remove_data = df_keyword_search_volume[
-        (df_keyword_search_volume["keyword_id"].isin(random_keywords))
-        & (df_keyword_search_volume["created_datetime"].isin(total_exception_ts))
-    ]
+    # Compare timestamps on their int64 (ns) representation to avoid object comparisons
+    exception_ts = pd.DatetimeIndex(total_exception_ts).asi8
+    created_ts = df_keyword_search_volume["created_datetime"].values.view("i8")
+    remove_mask = df_keyword_search_volume["keyword_id"].isin(
+        random_keywords
+    ).values & np.isin(created_ts, exception_ts)
+    df_remove_data = df_keyword_search_volume[remove_mask]
     df_keyword_search_volume = df_keyword_search_volume.drop(index=df_remove_data.index)
 
     return df_keyword_search_volume, df_remove_data
@@ -302,21 +309,21 @@ def generate_subscribes_sample():
 
 
 # Read config file (config.yml)
-config = None
-with open("config.yml", encoding="utf-8") as f:
-    config = yaml.load(f, Loader=yaml.FullLoader)
+config = load_config()
 
-# Init MySQL Connector
+# Redis client of the service's cached subscription ranges
+redis_url = config["CACHE"].get("CACHE_REDIS_URL")
+subscription_cache = redis.Redis.from_url(redis_url) if redis_url else None
+
+# Init MySQL Connector (the service initializes the connector engine)
 mysql = MySQLConnector(config["MYSQL_CONNECT"])
-mysql.init_engine()
+service = SearchVolumeService(mysql, cache=subscription_cache)
 
 # Step 1: Execute the SQL file to initialize schema (init_schema.sql)
 with open("sql/init_schema.sql", "r") as file:
     sql_script = file.read()
 
-for command in sql_script.split(";"):
-    if len(command) > 0:
-        mysql.execute_sql_command(command.strip())
+mysql.execute_sql_script(sql_script)
 logger.info("Initialize database schema successful")
 
 # Step 2: Add SQL Procedure for automate update `keyword_search_volume_daily` table
@@ -346,6 +353,12 @@ logger.info("Insert data into `users` table successful")
 mysql.insert_to_table("users_subscription", df_total_users_sub)
 logger.info("Insert data into `users_subscription` table successful")
 
+# Drop the cached subscription ranges of the inserted subscriptions
+users_keywords = df_total_users_sub[["USER_ID", "KEYWORD_ID"]].drop_duplicates()
+for user_id, keyword_id in users_keywords.itertuples(index=False):
+    service.invalidate_subscription_cache(user_id, keyword_id)
+logger.info("Invalidate cached subscription ranges successful")
+
 # Step 5: Running procedures
 mysql.execute_sql_command("call UpdateDailySearchVolumes()")
 logger.info("Running database procedure successful")
\ No newline at end of file
@@ -0,0 +1,8 @@
+import multiprocessing
+
+# Gunicorn configuration for serving `wsgi:app`.
+# The workload is MySQL-bound, so async (gevent) workers let other requests
+# progress while one is waiting on the database.
+bind = "0.0.0.0:5000"
+workers = multiprocessing.cpu_count()
+worker_class = "gevent"
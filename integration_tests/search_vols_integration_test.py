@@ -0,0 +1,40 @@
+import os
+import warnings
+
+import pytest
+
+from models.mysql import MySQLConnector
+from services.search_vols import SearchVolumeService
+from test_support.cases import CASES, assert_query_result
+from utils.config import load_config
+
+warnings.filterwarnings("ignore")
+
+# Full query flow tests against the MySQL database in `config.yml`, loaded with the
+# sample data of `generated_data.py`
+pytestmark = pytest.mark.skipif(
+    os.environ.get("EPSILO_RUN_INTEGRATION") != "1",
+    reason="integration DB not available",
+)
+
+
+@pytest.fixture(scope="session")
+def service():
+    # Create the connector once, shared by all tests
+    config = load_config()
+    mysql = MySQLConnector(config["MYSQL_CONNECT"])
+    service = SearchVolumeService(mysql)
+    yield service
+    mysql.dispose_engine()
+
+
+@pytest.mark.parametrize(
+    "query, expected_status, expected_results",
+    [pytest.param(*case, id=name) for name, *case in CASES],
+)
+def test_flow(service, query, expected_status, expected_results):
+    """
+    Test the query flow of a subscription case in `CASES` against the database.
+    """
+    result, status_code = service.execute_query_data(query)
+    assert_query_result(result, status_code, expected_status, expected_results)
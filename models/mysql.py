@@ -1,4 +1,3 @@
-import copy
 from functools import wraps
 from typing import Any, Callable, Optional
 
@@ -6,6 +5,7 @@ import loguru
 import numpy as np
 import pandas as pd
 import sqlalchemy as sqla
+import sqlparse
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import text
 
@@ -47,7 +47,8 @@ class MySQLConnector:
 
         Parameters:
             - config (dict): A dictionary containing configuration settings such as
-                USERNAME, PASSWORD, HOST, PORT, etc.
+                USERNAME, PASSWORD, HOST, PORT, etc. The connection pool can be tuned
+                with the optional POOL_SIZE, MAX_OVERFLOW and POOL_RECYCLE settings.
         """
         username = self.config["USERNAME"]
         password = self.config["PASSWORD"]
@@ -58,7 +59,20 @@ class MySQLConnector:
         self.engine_path = (
             f"mysql+pymysql://{username}:{password}@" f"{host}:{port}/{db_name}"
         )
-        self.engine = sqla.create_engine(self.engine_path)
+        self.engine = sqla.create_engine(
+            self.engine_path,
+            pool_size=self.config.get("POOL_SIZE", 20),
+            max_overflow=self.config.get("MAX_OVERFLOW", 40),
+            pool_recycle=self.config.get("POOL_RECYCLE", 1800),
+            pool_pre_ping=True,
+        )
+
+    @check_driver_engine
+    def dispose_engine(self) -> None:
+        """
+        Close all pooled connections of the MySQL connector engine.
+        """
+        self.engine.dispose()
 
     @check_driver_engine
     def execute_sql_command(self, sql: str) -> None:
@@ -71,12 +85,28 @@ class MySQLConnector:
         with Session(self.engine) as session, session.begin():
             session.execute(text(sql))
 
+    @check_driver_engine
+    def execute_sql_script(self, sql_script: str) -> None:
+        """
+        Execute all SQL statements of the provided SQL script in a single session and
+        connection. MySQL commits DDL statements implicitly, so a failing statement
+        does not roll back the statements before it.
+
+        Parameters:
+            sql_script (str): The SQL script, statements are separated by ";".
+        """
+        statements = [stmt for stmt in sqlparse.split(sql_script) if stmt.strip()]
+        with Session(self.engine) as session, session.begin():
+            for statement in statements:
+                session.execute(text(statement))
+
     @check_driver_engine
     def insert_to_table(
         self, table_name: str, df: pd.DataFrame, schema: str = None
     ) -> None:
         """
         Insert a provided Pandas DataFrame into the specified table in the database.
+        Rows are written with multi-values INSERT statements of up to 10000 rows each.
 
         Parameters:
             - table_name (str): The name of the table in the database.
@@ -84,9 +114,9 @@ class MySQLConnector:
             - schema (str): The name of the schema where the table created in the database
         """
         if not df.empty:
-            data = copy.deepcopy(df)
+            # Only relabel the columns, the underlying data is not copied
+            data = df.rename(columns=str.lower, copy=False)
             table_name = table_name.lower()
-            data.columns = data.columns.str.lower()
             data.to_sql(
                 table_name,
                 self.engine,
@@ -94,6 +124,7 @@ class MySQLConnector:
                 index=False,
                 chunksize=10000,
                 schema=schema,
+                method="multi",
             )
 
     @check_driver_engine
@@ -151,16 +182,65 @@ class MySQLConnector:
         return result
 
     @check_driver_engine
-    def query_with_sql_command(self, sql: str) -> pd.DataFrame:
+    def query_with_sql_command(self, sql: str, params: dict = None) -> pd.DataFrame:
         """
         Query data from the database with provided SQL command.
 
         Parameters:
-            sql (str): The SQL command to execute.
+            - sql (str): The SQL command to execute.
+            - params (dict): The values of the bind parameters (`:name`) in the SQL.
+                List values are expanded, e.g. for `IN :name` conditions.
 
         Returns:
             pd.DataFrame: The resulting query DataFrame
         """
-        result = pd.read_sql_query(text(sql), self.engine)
+        query = self._build_sql_query(sql, params)
+        result = pd.read_sql_query(query, self.engine, params=params)
         result.columns = map(str.upper, result.columns)
-        return result
\ No newline at end of file
+        return result
+
+    @check_driver_engine
+    def query_rows(self, sql: str, params: dict = None) -> list:
+        """
+        Query data from the database with provided SQL command, returning the rows
+        directly instead of building a DataFrame.
+
+        Parameters:
+            - sql (str): The SQL command to execute.
+            - params (dict): The values of the bind parameters (`:name`) in the SQL.
+                List values are expanded, e.g. for `IN :name` conditions.
+
+        Returns:
+            list: The resulting rows, as dictionaries with upper-case column names.
+        """
+        query = self._build_sql_query(sql, params)
+        with Session(self.engine) as session:
+            result = session.execute(query, params)
+            return [
+                {key.upper(): value for key, value in row.items()}
+                for row in result.mappings()
+            ]
+
+    @staticmethod
+    def _build_sql_query(sql: str, params: dict = None) -> sqla.TextClause:
+        """
+        Build the executable SQL text clause, bind parameters with list values are
+        declared as expanding parameters.
+
+        Parameters:
+            - sql (str): The SQL command.
+            - params (dict): The values of the bind parameters (`:name`) in the SQL.
+
+        Returns:
+            TextClause: The SQL text clause.
+        """
+        query = text(sql)
+        if params is not None:
+            query = query.bindparams(
+                *[
+                    sqla.bindparam(key, expanding=True)
+                    for key, value in params.items()
+                    if isinstance(value, list)
+                ]
+            )
+        return query
\ No newline at end of file
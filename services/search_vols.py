@@ -1,11 +1,16 @@
-import bisect
 import traceback
-from datetime import datetime, timezone
+from datetime import datetime
+from typing import Any, Optional
 
+import loguru
+import numpy as np
 import pandas as pd
-import yaml
 
 from models.mysql import MySQLConnector
+from utils.config import load_config
+
+# Time-to-live (seconds) of the cached merged subscription ranges
+SUBSCRIPTION_CACHE_TTL = 3600
 
 
 class SearchVolumeService:
@@ -13,15 +18,26 @@ class SearchVolumeService:
     Service class for executing search volume queries with user subscription validation.
     """
 
-    def __init__(self, sql: MySQLConnector) -> None:
+    # Required request fields (in error message order) and supported timings
+    _REQUIRED_FIELDS = ("user_id", "keywords_id", "timing", "start_time", "end_time")
+    _VALID_TIMINGS = frozenset({"HOURLY", "DAILY"})
+
+    def __init__(self, sql: MySQLConnector, cache: Optional[Any] = None) -> None:
         """
         Initializes class instance.
 
         Parameters:
-            config (dict): The configuration in dictionary format.
+            - sql (MySQLConnector): The MySQL connector.
+            - cache (redis.Redis): Optional Redis client, used to cache the merged
+                subscription ranges of users.
         """
         self.mysql = sql
         self.mysql.init_engine()
+        self.cache = cache
+        self.logger = loguru.logger
+
+        # In-memory mapping of keyword_id -> keyword_name (see `_get_keyword_names`)
+        self.keyword_names: dict = {}
 
     def _validate_input(self, request: dict) -> tuple:
         """
@@ -33,46 +49,43 @@ class SearchVolumeService:
         Returns:
             tuple: (bool, dict) - True if valid, otherwise False with error messages.
         """
-        expected_fields = ["user_id", "keywords_id", "timing", "start_time", "end_time"]
-        missing_fields = []
-        errors_msg = ""
-
-        for field in expected_fields:
-            field_value = request.get(field)
-            if not field_value:
-                # errors[field] = f"Missing required field. Please check !!!"
-                missing_fields.append(field)
-
+        # Empty values (e.g. `?timing=`) are missing as well as absent fields
+        missing_fields = [
+            field for field in self._REQUIRED_FIELDS if not request.get(field)
+        ]
         if len(missing_fields) > 0:
-            errors_msg = f"Missing required fields {', '.join(missing_fields)}."
-            return False, errors_msg
+            return False, f"Missing required fields {', '.join(missing_fields)}."
 
-        if request["timing"] not in ["HOURLY", "DAILY"]:
-            errors_msg = f"Only support 'HOURLY' and 'DAILY' timing."
+        if request["timing"] not in self._VALID_TIMINGS:
+            return False, "Only support 'HOURLY' and 'DAILY' timing."
 
-        return (len(errors_msg) == 0), errors_msg
+        return True, ""
 
     def _check_query_time_range(
-        self, start_time: datetime, end_time: datetime, subscription_range: list
+        self, query_start: int, query_end: int, subscription_range: tuple
     ) -> bool:
         """
         Checks if the given time range falls within the provided subscription ranges.
 
         Parameters:
-            - start_time (datetime): Query start time.
-            - end_time (datetime): Query end time.
-            - subscription_ranges (list): List of dictionaries with "START_TIME" and "END_TIME".
+            - query_start (int): Query start time as UTC epoch seconds.
+            - query_end (int): Query end time as UTC epoch seconds.
+            - subscription_range (tuple): (starts, ends) arrays of the merged
+                subscription ranges as int64 UTC epoch seconds, sorted by start.
 
         Returns:
             bool: True if the query range is within a subscription range, else False.
         """
-        range_starts = [r["START_TIME"] for r in subscription_range]
-        range_ends = [r["END_TIME"] for r in subscription_range]
+        range_starts, range_ends = subscription_range
 
         # Binary search
-        pos = bisect.bisect_right(range_starts, start_time) - 1
+        pos = np.searchsorted(range_starts, query_start, side="right") - 1
 
-        if pos >= 0 and start_time >= range_starts[pos] and end_time <= range_ends[pos]:
+        if (
+            pos >= 0
+            and query_start >= range_starts[pos]
+            and query_end <= range_ends[pos]
+        ):
             return True
 
         return False
@@ -87,51 +100,194 @@ class SearchVolumeService:
         Returns:
             DataFrame: A DataFrame with merged time ranges.
         """
-        merged_range = []
+        # Merging (and the binary search over the merged ranges) needs the
+        # subscriptions ordered by start time
+        df = df.sort_values("START_TIME", kind="mergesort")
+        starts = pd.to_datetime(df["START_TIME"]).values.view("i8")
+        ends = pd.to_datetime(df["END_TIME"]).values.view("i8")
+
+        # A new range begins when a subscription starts after every previous
+        # subscription has ended, the others are merged into the current range.
+        running_ends = np.maximum.accumulate(ends)
+        new_range = np.ones(len(df), dtype=bool)
+        new_range[1:] = starts[1:] > running_ends[:-1]
+        range_ids = np.cumsum(new_range)
+
+        merged_df = (
+            df.groupby(range_ids)
+            .agg(START_TIME=("START_TIME", "min"), END_TIME=("END_TIME", "max"))
+            .reset_index(drop=True)
+        )
+        return merged_df
+
+    @staticmethod
+    def _subscription_cache_key(user_id: int, keyword_id: int, timing: str) -> str:
+        """
+        Builds the cache key of the merged subscription ranges.
+        """
+        return f"subs:{user_id}:{keyword_id}:{timing}"
 
-        for row in df.to_dict("records"):
-            start, end = row["START_TIME"], row["END_TIME"]
+    @staticmethod
+    def _subscription_range_arrays(merged_subs: pd.DataFrame) -> tuple:
+        """
+        Converts merged subscription ranges into (starts, ends) int64 arrays of UTC
+        epoch seconds. Seconds rather than nanoseconds, so that far-future query
+        times (beyond year 2262) stay comparable.
+        """
+        starts = pd.to_datetime(merged_subs["START_TIME"], utc=True).values
+        ends = pd.to_datetime(merged_subs["END_TIME"], utc=True).values
+        return starts.astype("M8[s]").view("i8"), ends.astype("M8[s]").view("i8")
 
-            if len(merged_range) == 0 or start > merged_range[-1][1]:
-                merged_range.append([start, end])
-            else:
-                merged_range[-1][1] = max(merged_range[-1][1], end)
+    @staticmethod
+    def _encode_subscription_range(subscription_range: tuple) -> bytes:
+        """
+        Serializes (starts, ends) arrays into the cache payload, the flattened
+        (start, end) pairs as little-endian int64 UTC epoch seconds.
+        """
+        return np.column_stack(subscription_range).astype("<i8").tobytes()
 
-        merged_df = pd.DataFrame(merged_range, columns=["START_TIME", "END_TIME"])
-        return merged_df
+    @staticmethod
+    def _decode_subscription_range(payload: bytes) -> tuple:
+        """
+        Deserializes a cache payload into (starts, ends) arrays.
+        """
+        ranges = np.frombuffer(payload, dtype="<i8").reshape(-1, 2)
+        return ranges[:, 0], ranges[:, 1]
 
-    def _check_user_subscriptions(self, params: dict, user_subs: pd.DataFrame) -> tuple:
+    def _merge_subscription_range(self, timing: str, user_subs: pd.DataFrame) -> tuple:
         """
-        Validates if the user's subscription covers the requested time range.
+        Merges the user's subscriptions of a keyword usable for the query timing.
 
         Parameters:
-            - params (dict): Request parameters.
+            - timing (str): The query timing, "HOURLY" or "DAILY".
             - user_subs (DataFrame): DataFrame containing user subscription details.
 
         Returns:
-            tuple: (bool, str) - True if valid, otherwise False with an error message.
+            tuple: (starts, ends) arrays of the merged ranges as int64 UTC epoch
+                seconds, empty if no subscription is usable for the timing.
         """
-        # Determine if the user has the required subscription level
-        available_subscriptions = user_subs["SUBSCRIPTION_TYPE"].unique().tolist()
+        # HOURLY data needs a HOURLY subscription, DAILY data is included in both
+        if timing == "HOURLY":
+            user_subs = user_subs[user_subs["SUBSCRIPTION_TYPE"] == "HOURLY"]
 
-        if (
-            params["timing"] == "HOURLY"
-            and params["timing"] not in available_subscriptions
-        ):
-            status = "Hourly data requires an hourly subscription"
-            return False, status
+        if len(user_subs) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        merged_subs = self._union_subscription_time(user_subs)
+        return self._subscription_range_arrays(merged_subs)
+
+    def _get_subscription_ranges(
+        self, user_id: int, keywords_id: list, timing: str
+    ) -> dict:
+        """
+        Gets the user's merged subscription ranges of each keyword. Cached ranges are
+        read first, only the keywords missing from the cache are queried from MySQL
+        and their ranges are cached.
+
+        Parameters:
+            - user_id: The user ID.
+            - keywords_id (list): List of keyword IDs.
+            - timing (str): The query timing, "HOURLY" or "DAILY".
+
+        Returns:
+            dict: The (starts, ends) ranges of each keyword, keywords without any
+                subscription of the user are left out.
+        """
+        subscription_ranges = {}
+        missing_keywords = keywords_id
+        if self.cache is not None:
+            keys = [
+                self._subscription_cache_key(user_id, keyword, timing)
+                for keyword in keywords_id
+            ]
+            try:
+                payloads = self.cache.mget(keys)
+            except Exception as e:
+                self.logger.warning(f"Failed to read subscription cache: {e}")
+                payloads = [None] * len(keys)
+
+            for keyword, payload in zip(keywords_id, payloads):
+                if payload is not None:
+                    subscription_ranges[keyword] = self._decode_subscription_range(
+                        payload
+                    )
+            missing_keywords = [
+                kw for kw in keywords_id if kw not in subscription_ranges
+            ]
+
+        if len(missing_keywords) == 0:
+            return subscription_ranges
+
+        users_sub_df: pd.DataFrame = self.mysql.query_with_in_list_condition(
+            "users_subscription",
+            ",".join(["keyword_id", "subscription_type", "start_time", "end_time"]),
+            user_id=[user_id],
+            keyword_id=missing_keywords,
+        )
+
+        # Split the subscriptions by keyword in a single grouping pass
+        for keyword, user_subs in users_sub_df.groupby("KEYWORD_ID", sort=False):
+            keyword = int(keyword)
+            subscription_range = self._merge_subscription_range(timing, user_subs)
+            subscription_ranges[keyword] = subscription_range
+
+            if self.cache is not None:
+                key = self._subscription_cache_key(user_id, keyword, timing)
+                payload = self._encode_subscription_range(subscription_range)
+                try:
+                    self.cache.setex(key, SUBSCRIPTION_CACHE_TTL, payload)
+                except Exception as e:
+                    self.logger.warning(
+                        f"Failed to write subscription cache {key}: {e}"
+                    )
+
+        return subscription_ranges
+
+    def invalidate_subscription_cache(self, user_id: int, keyword_id: int) -> None:
+        """
+        Removes the cached subscription ranges of a user's keyword. Must be called
+        whenever the subscriptions of the user for the keyword are changed.
+
+        Parameters:
+            - user_id: The user ID.
+            - keyword_id: The keyword ID.
+        """
+        if self.cache is None:
+            return
+
+        keys = [
+            self._subscription_cache_key(user_id, keyword_id, timing)
+            for timing in self._VALID_TIMINGS
+        ]
+        try:
+            self.cache.delete(*keys)
+        except Exception as e:
+            self.logger.warning(f"Failed to invalidate subscription cache: {e}")
 
-        # Validate query date range with `subscription_type = "HOURLY"`
-        if params["timing"] == "HOURLY":
-            relevant_subs = user_subs[user_subs["SUBSCRIPTION_TYPE"] == "HOURLY"]
+    def _check_subscription_range(
+        self, params: dict, subscription_range: tuple
+    ) -> tuple:
+        """
+        Validates if the merged subscription ranges cover the requested time range.
 
-        # Validate query date range with `subscription_type = "DAILY"`
-        else:
-            relevant_subs = user_subs
+        Parameters:
+            - params (dict): Request parameters, "start_time" and "end_time" are UTC
+                `pd.Timestamp`.
+            - subscription_range (tuple): (starts, ends) arrays of the merged
+                subscription ranges usable for the query timing.
+
+        Returns:
+            tuple: (bool, str) - True if valid, otherwise False with an error message.
+        """
+        # No usable range means the user only has DAILY subscriptions
+        if params["timing"] == "HOURLY" and len(subscription_range[0]) == 0:
+            status = "Hourly data requires an hourly subscription"
+            return False, status
 
-        merged_subs = self._union_subscription_time(relevant_subs)
         valid = self._check_query_time_range(
-            params["start_time"], params["end_time"], merged_subs.to_dict("records")
+            int(params["start_time"].timestamp()),
+            int(params["end_time"].timestamp()),
+            subscription_range,
         )
 
         if not valid:
@@ -142,56 +298,89 @@ class SearchVolumeService:
 
         return True, None
 
+    def _get_keyword_names(self, keywords_id: list) -> dict:
+        """
+        Gets keyword names from the in-memory mapping. The `keywords` table is
+        (re)loaded only when some of the requested keywords are not cached yet.
+
+        Parameters:
+            - keywords_id (list): List of keyword IDs.
+
+        Returns:
+            dict: Keyword name of each keyword ID.
+        """
+        if any(keyword not in self.keyword_names for keyword in keywords_id):
+            keywords_df = self.mysql.query_with_sql_command(
+                "SELECT keyword_id, keyword_name FROM keywords"
+            )
+            self.keyword_names = dict(
+                zip(keywords_df["KEYWORD_ID"], keywords_df["KEYWORD_NAME"])
+            )
+
+        return {keyword: self.keyword_names.get(keyword) for keyword in keywords_id}
+
     def _query_search_volume_data(
-        self, keyword_id: str, start_time: datetime, end_time: datetime, subs_type: str
-    ) -> list:
+        self,
+        keywords_id: list,
+        start_time: datetime,
+        end_time: datetime,
+        subs_type: str,
+    ) -> tuple:
         """
-        Queries search volume data.
+        Queries search volume data of multiple keywords at once.
 
         Parameters:
-            - keyword_id (str): Keyword ID.
+            - keywords_id (list): List of keyword IDs.
             - start_time (datetime): Start time of the query.
             - end_time (datetime): End time of the query.
             - subs_type (str): "HOURLY" or "DAILY".
 
         Returns:
-            tuple: (list, str) - Search volume data records and keyword name.
+            tuple: (dict, dict) - Search volume data records and keyword name,
+                both keyed by keyword ID.
         """
         table = None
-        keywords_df = self.mysql.query_with_in_list_condition(
-            "keywords", keyword_id=[keyword_id]
-        )
-        keyword_name = keywords_df.iloc[0]["KEYWORD_NAME"]
+        params = {
+            "keywords_id": keywords_id,
+            "start_time": start_time,
+            "end_time": end_time,
+        }
 
         if subs_type == "HOURLY":
             table = "keyword_search_volume"
             query = f"""
-                SELECT created_datetime, search_volume
+                SELECT keyword_id, created_datetime, search_volume
                 FROM {table}
-                WHERE keyword_id = {keyword_id}
-                AND created_datetime BETWEEN '{start_time.strftime('%Y-%m-%d %H:%M:%S')}' AND '{end_time.strftime('%Y-%m-%d %H:%M:%S')}'
-                ORDER BY created_datetime
+                WHERE keyword_id IN :keywords_id
+                AND created_datetime BETWEEN :start_time AND :end_time
+                ORDER BY keyword_id, created_datetime
             """
-            df = self.mysql.query_with_sql_command(query)
-            df["CREATED_DATETIME"] = pd.to_datetime(df["CREATED_DATETIME"]).dt.strftime(
-                "%Y-%m-%dT%H:%M:%S"
-            )
+            rows = self.mysql.query_rows(query, params)
 
         elif subs_type == "DAILY":
             table = "keyword_search_volume_daily"
+            # Cast to DATETIME so dates are serialized as "%Y-%m-%dT%H:%M:%S" as well.
+            # ORDER BY qualifies the column, an unqualified `created_date` would
+            # resolve to the CAST alias and sort outside the primary key order.
             query = f"""
-                SELECT created_date, search_volume
+                SELECT
+                    keyword_id,
+                    CAST(created_date AS DATETIME) AS created_date,
+                    search_volume
                 FROM {table}
-                WHERE keyword_id = {keyword_id}
-                AND created_date BETWEEN '{start_time.strftime('%Y-%m-%d %H:%M:%S')}' AND '{end_time.strftime('%Y-%m-%d %H:%M:%S')}'
-                ORDER BY created_date
+                WHERE keyword_id IN :keywords_id
+                AND created_date BETWEEN :start_time AND :end_time
+                ORDER BY keyword_id, {table}.created_date
             """
-            df = self.mysql.query_with_sql_command(query)
-            df["CREATED_DATE"] = pd.to_datetime(df["CREATED_DATE"]).dt.strftime(
-                "%Y-%m-%dT%H:%M:%S"
-            )
+            rows = self.mysql.query_rows(query, params)
+
+        keyword_names = self._get_keyword_names(keywords_id)
 
-        return df.to_dict("records"), keyword_name
+        # Split the records of the batched query by keyword
+        search_volumes = {}
+        for row in rows:
+            search_volumes.setdefault(row.pop("KEYWORD_ID"), []).append(row)
+        return search_volumes, keyword_names
 
     def execute_query_data(self, request: dict) -> tuple:
         """
@@ -205,72 +394,82 @@ class SearchVolumeService:
         if not valid:
             return errors, 400
 
+        # MySQL casts "03" or " 3" to 3, so the user ID is parsed once and the
+        # subscription cache keys are always built from the canonical integer
+        try:
+            user_id = int(request["user_id"])
+        except (TypeError, ValueError):
+            return "Invalid user_id, must be an integer.", 400
+
         try:
             keywords_id_lst = [
                 int(kw.strip()) for kw in request["keywords_id"].split(",")
             ]
+            # Parse the epoch timestamps once, truncated to the UTC day
             params = {
-                "user_id": request["user_id"],
-                "keywords_id": keywords_id_lst,
+                "user_id": user_id,
                 "timing": request["timing"],
-                "start_time": datetime.fromtimestamp(
-                    int(request["start_time"]), tz=timezone.utc
-                ).date(),
-                "end_time": datetime.fromtimestamp(
-                    int(request["end_time"]), tz=timezone.utc
-                ).date(),
+                "start_time": pd.Timestamp(
+                    int(request["start_time"]), unit="s", tz="UTC"
+                ).normalize(),
+                "end_time": pd.Timestamp(
+                    int(request["end_time"]), unit="s", tz="UTC"
+                ).normalize(),
             }
 
             # Check for user subscription validation
-            users_sub_df: pd.DataFrame = self.mysql.query_with_in_list_condition(
-                "users_subscription",
-                ",".join(["keyword_id", "subscription_type", "start_time", "end_time"]),
-                user_id=[params["user_id"]],
-                keyword_id=params["keywords_id"],
+            subscription_ranges = self._get_subscription_ranges(
+                params["user_id"], keywords_id_lst, params["timing"]
             )
 
-            if len(users_sub_df) == 0:
+            if len(subscription_ranges) == 0:
                 status = f"User doesn't have any subscriptions with keywords_id {','.join(str(x) for x in keywords_id_lst)}"
                 return status, 403
 
-            query_result = []
-            user_subs_kw_ids = users_sub_df["KEYWORD_ID"].unique().tolist()
+            keywords_status = {}
             for keyword in keywords_id_lst:
-                if keyword not in user_subs_kw_ids:
+                if keyword not in subscription_ranges:
                     status = f"No subscriptions found for the keyword_id {keyword}"
-                    result = {
-                        "keyword_id": keyword,
-                        "error": True,
-                        "status": status,
-                        "data": [],
-                    }
-                    query_result.append(result)
+                    keywords_status[keyword] = status
                     continue
 
                 # Check user subscriptions for each keyword only
-                keyword_subs_df = users_sub_df[users_sub_df["KEYWORD_ID"] == keyword]
-                valid, status = self._check_user_subscriptions(params, keyword_subs_df)
+                valid, status = self._check_subscription_range(
+                    params, subscription_ranges[keyword]
+                )
 
                 if not valid:
+                    keywords_status[keyword] = status
+
+            # Query data of all valid keywords in a single round-trip, skip the
+            # query entirely when no keyword passed the subscription validation
+            valid_keywords = [kw for kw in keywords_id_lst if kw not in keywords_status]
+            search_volumes, keyword_names = {}, {}
+            if len(valid_keywords) > 0:
+                search_volumes, keyword_names = self._query_search_volume_data(
+                    valid_keywords,
+                    params["start_time"].date(),
+                    params["end_time"].date(),
+                    params["timing"],
+                )
+
+            query_result = []
+            for keyword in keywords_id_lst:
+                if keyword in keywords_status:
                     result = {
                         "keyword_id": keyword,
                         "error": True,
-                        "status": status,
+                        "status": keywords_status[keyword],
                         "data": [],
                     }
-                    query_result.append(result)
-                    continue
-
-                query_data, keyword_name = self._query_search_volume_data(
-                    keyword, params["start_time"], params["end_time"], params["timing"]
-                )
-                result = {
-                    "keyword_id": keyword,
-                    "keyword_name": keyword_name,
-                    "error": False,
-                    "status": "Successful",
-                    "data": query_data,
-                }
+                else:
+                    result = {
+                        "keyword_id": keyword,
+                        "keyword_name": keyword_names.get(keyword),
+                        "error": False,
+                        "status": "Successful",
+                        "data": search_volumes.get(keyword, []),
+                    }
                 query_result.append(result)
 
             return query_result, 200
@@ -283,9 +482,7 @@ class SearchVolumeService:
 
 if __name__ == "__main__":
     # Read config file (config.yml)
-    config = None
-    with open("config.yml", encoding="utf-8") as f:
-        config = yaml.load(f, Loader=yaml.FullLoader)
+    config = load_config()
 
     mysql = MySQLConnector(config["MYSQL_CONNECT"])
 
@@ -19,10 +19,14 @@ CREATE TABLE IF NOT EXISTS users_subscription (
     subscription_type ENUM('HOURLY', 'DAILY') NOT NULL,
     start_time DATE NOT NULL,
     end_time DATE NOT NULL,
+    -- Index for looking up subscriptions of a user by keywords
+    INDEX ix_users_subscription_user_keyword (user_id, keyword_id),
     FOREIGN KEY (user_id) REFERENCES users(user_id),
     FOREIGN KEY (keyword_id) REFERENCES keywords(keyword_id)
 );
 -- Table to store hourly search volume data (original table)
+-- The (keyword_id, created_datetime) primary key is the clustered index serving
+-- `keyword_id IN (...) AND created_datetime BETWEEN ... AND ...` range scans.
 CREATE TABLE IF NOT EXISTS keyword_search_volume (
     keyword_id BIGINT,
     created_datetime DATETIME,
@@ -31,6 +35,7 @@ CREATE TABLE IF NOT EXISTS keyword_search_volume (
     FOREIGN KEY (keyword_id) REFERENCES keywords(keyword_id)
 );
 -- Table to store daily search volume data (9:00 AM or nearest)
+-- The (keyword_id, created_date) primary key serves the daily range scans.
 CREATE TABLE IF NOT EXISTS keyword_search_volume_daily (
     keyword_id BIGINT,
     created_date DATE,
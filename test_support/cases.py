@@ -0,0 +1,353 @@
+"""
+Requests and expected results of the full query flow, shared by the unit tests
+(mocked connector) and the integration tests (MySQL database).
+"""
+
+from types import MappingProxyType
+
+# Requests of the tests, built once at import time (read-only)
+REQUESTS = {
+    "validate_input_missing_fields": MappingProxyType(
+        {"user_id": 1, "keywords_id": "1,2"}
+    ),
+    "validate_input_invalid_timing": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1,2",
+            "timing": "MONTHLY",
+            "start_time": "1609459200",
+            "end_time": "1609545600",
+        }
+    ),
+    "validate_input_valid": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1,2",
+            "timing": "DAILY",
+            "start_time": "1609459200",
+            "end_time": "1609545600",
+        }
+    ),
+    "input_validation_failed_1": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "HOURLY",
+        }
+    ),
+    "input_validation_failed_2": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "start_time": "1672531200",
+            "end_time": "1672790400",
+        }
+    ),
+    "input_validation_failed_3": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "MONTHLY",
+            "start_time": "1672531200",
+            "end_time": "1672790400",
+        }
+    ),
+    "input_validation_failed_4": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "DAILY",
+            "start_time": "Khang",
+            "end_time": "1672790400",
+        }
+    ),
+    "input_validation_failed_5": MappingProxyType(
+        {
+            "user_id": "Khang",
+            "keywords_id": "1",
+            "timing": "DAILY",
+            "start_time": "1672531200",
+            "end_time": "1672790400",
+        }
+    ),
+    "non_canonical_user_id": MappingProxyType(
+        {
+            "user_id": " 01",
+            "keywords_id": "1",
+            "timing": "HOURLY",
+            "start_time": "1735689600",  # 2025-01-01
+            "end_time": "1736035200",  # 2025-01-05
+        }
+    ),
+    "no_subscription_for_keyword": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "3,2",
+            "timing": "DAILY",
+            "start_time": "1672531200",
+            "end_time": "1672790400",
+        }
+    ),
+    "far_future_end_time": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "HOURLY",
+            "start_time": "1736985600",  # 2025-01-16
+            "end_time": "99999999999",  # 5138-11-16
+        }
+    ),
+    "hourly_after_subscription_end": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "HOURLY",
+            "start_time": "1736985600",  # 2025-01-16
+            "end_time": "1737763200",  # 2025-01-25
+        }
+    ),
+    "insufficient_subscription_type": MappingProxyType(
+        {
+            "user_id": 2,
+            "keywords_id": "5",
+            "timing": "HOURLY",
+            "start_time": "1672531200",
+            "end_time": "1736899200",
+        }
+    ),
+    "valid_hourly_subscription_single_keyword_1": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "HOURLY",
+            "start_time": "1735689600",  # 2025-01-01
+            "end_time": "1736035200",  # 2025-01-05
+        }
+    ),
+    "valid_hourly_subscription_single_keyword_2": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "HOURLY",
+            "start_time": "1736294400",  # 2025-01-08
+            "end_time": "1736985600",  # 2025-01-16
+        }
+    ),
+    "invalid_hourly_subscription_single_keyword": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "HOURLY",
+            "start_time": "1736985600",  # 2025-01-16
+            "end_time": "1737763200",  # 2025-01-25
+        }
+    ),
+    "valid_daily_subscription_single_keyword_1": MappingProxyType(
+        {
+            "user_id": 2,
+            "keywords_id": "5",
+            "timing": "DAILY",
+            "start_time": "1735689600",  # 2025-01-01
+            "end_time": "1736035200",  # 2025-01-05
+        }
+    ),
+    "valid_daily_subscription_single_keyword_2": MappingProxyType(
+        {
+            "user_id": 2,
+            "keywords_id": "5",
+            "timing": "DAILY",
+            "start_time": "1735689600",  # 2025-01-01
+            "end_time": "1737331200",  # 2025-01-20
+        }
+    ),
+    "invalid_daily_subscription_single_keyword": MappingProxyType(
+        {
+            "user_id": 1,
+            "keywords_id": "1",
+            "timing": "DAILY",
+            "start_time": "1737763200",  # 2025-01-25
+            "end_time": "1738195200",  # 2025-01-30
+        }
+    ),
+    "valid_hourly_subscription_multiple_keyword_1": MappingProxyType(
+        {
+            "user_id": 3,
+            "keywords_id": "1,2",
+            "timing": "HOURLY",
+            "start_time": "1736035200",  # 2025-01-05
+            "end_time": "1736467200",  # 2025-01-10
+        }
+    ),
+    "valid_hourly_subscription_multiple_keyword_2": MappingProxyType(
+        {
+            "user_id": 3,
+            "keywords_id": "1,2",
+            "timing": "HOURLY",
+            "start_time": "1736467200",  # 2025-01-10
+            "end_time": "1736899200",  # 2025-01-15
+        }
+    ),
+    "invalid_hourly_subscription_multiple_keyword": MappingProxyType(
+        {
+            "user_id": 3,
+            "keywords_id": "1,2",
+            "timing": "HOURLY",
+            "start_time": "1738368000",  # 2025-02-01
+            "end_time": "1738454400",  # 2025-02-02
+        }
+    ),
+    "valid_daily_subscription_multiple_keyword_1": MappingProxyType(
+        {
+            "user_id": 4,
+            "keywords_id": "6,7,8",
+            "timing": "DAILY",
+            "start_time": "1736035200",  # 2025-01-05
+            "end_time": "1736121600",  # 2025-01-06
+        }
+    ),
+    "valid_daily_subscription_multiple_keyword_2": MappingProxyType(
+        {
+            "user_id": 4,
+            "keywords_id": "6,7,8",
+            "timing": "DAILY",
+            "start_time": "1736553600",  # 2025-01-11
+            "end_time": "1736640000",  # 2025-01-12
+        }
+    ),
+    "valid_daily_subscription_multiple_keyword_3": MappingProxyType(
+        {
+            "user_id": 4,
+            "keywords_id": "6,7,8",
+            "timing": "DAILY",
+            "start_time": "1738368000",  # 2025-02-01
+            "end_time": "1738454400",  # 2025-02-02
+        }
+    ),
+    "overlap_hourly_daily_query_1": MappingProxyType(
+        {
+            "user_id": 5,
+            "keywords_id": "2",
+            "timing": "DAILY",
+            "start_time": "1735689600",  # 2025-01-01
+            "end_time": "1735948800",  # 2025-01-04
+        }
+    ),
+    "overlap_hourly_daily_query_2": MappingProxyType(
+        {
+            "user_id": 5,
+            "keywords_id": "2",
+            "timing": "HOURLY",
+            "start_time": "1736726400",  # 2025-01-13
+            "end_time": "1736899200",  # 2025-01-15
+        }
+    ),
+    "valid_daily_hourly_subscription_multiple_keyword_1": MappingProxyType(
+        {
+            "user_id": 6,
+            "keywords_id": "2,4",
+            "timing": "HOURLY",
+            "start_time": "1736035200",  # 2025-01-05
+            "end_time": "1736640000",  # 2025-01-12
+        }
+    ),
+}
+
+
+# Status messages of the keyword results
+MSG_OK = "Successful"
+MSG_OOR = "query time range is out of subscription time range."
+MSG_NO_HOURLY = "Hourly data requires an hourly subscription"
+
+# Expected result of each requested keyword in the full query flow
+SUCCESS = MappingProxyType({"error": False, "status": MSG_OK})
+NO_HOURLY_SUBSCRIPTION = MappingProxyType({"error": True, "status": MSG_NO_HOURLY})
+HOURLY_OUT_OF_RANGE = MappingProxyType({"error": True, "status": f"HOURLY {MSG_OOR}"})
+DAILY_OUT_OF_RANGE = MappingProxyType({"error": True, "status": f"DAILY {MSG_OOR}"})
+
+# Full query flow cases: (name, request, expected status code, expected results or
+# message)
+CASES = [
+    (name, REQUESTS[name], 200, expected)
+    for name, expected in [
+        # HOURLY query with only DAILY subscription
+        ("insufficient_subscription_type", [NO_HOURLY_SUBSCRIPTION]),
+        # Hourly subscription for a single keyword (non-overlap subscription time)
+        ("valid_hourly_subscription_single_keyword_1", [SUCCESS]),
+        # Hourly subscription for a single keyword (overlap subscription time)
+        ("valid_hourly_subscription_single_keyword_2", [SUCCESS]),
+        # Hourly subscription for a single keyword (out of subscription time)
+        ("invalid_hourly_subscription_single_keyword", [HOURLY_OUT_OF_RANGE]),
+        # Daily subscription for a single keyword (non-overlap subscription time)
+        ("valid_daily_subscription_single_keyword_1", [SUCCESS]),
+        # Daily subscription for a single keyword (overlap subscription time)
+        ("valid_daily_subscription_single_keyword_2", [SUCCESS]),
+        # Daily subscription for a single keyword (out of subscription time)
+        ("invalid_daily_subscription_single_keyword", [DAILY_OUT_OF_RANGE]),
+        # Hourly subscription for multiple keywords (2 keywords are valid)
+        ("valid_hourly_subscription_multiple_keyword_1", [SUCCESS, SUCCESS]),
+        # Hourly subscription for multiple keywords (1 keyword is valid)
+        (
+            "valid_hourly_subscription_multiple_keyword_2",
+            [HOURLY_OUT_OF_RANGE, SUCCESS],
+        ),
+        # Hourly subscription for multiple keywords (2 keywords are invalid)
+        (
+            "invalid_hourly_subscription_multiple_keyword",
+            [HOURLY_OUT_OF_RANGE, HOURLY_OUT_OF_RANGE],
+        ),
+        # Daily subscription for multiple keywords (3 keywords are valid)
+        (
+            "valid_daily_subscription_multiple_keyword_1",
+            [SUCCESS, SUCCESS, SUCCESS],
+        ),
+        # Daily subscription for multiple keywords (2 keywords are valid, 1 invalid)
+        (
+            "valid_daily_subscription_multiple_keyword_2",
+            [DAILY_OUT_OF_RANGE, SUCCESS, SUCCESS],
+        ),
+        # Daily subscription for multiple keywords (3 keywords are invalid)
+        (
+            "valid_daily_subscription_multiple_keyword_3",
+            [DAILY_OUT_OF_RANGE, DAILY_OUT_OF_RANGE, DAILY_OUT_OF_RANGE],
+        ),
+        # Hourly/daily subscription for a same keyword (hourly sees the daily data)
+        ("overlap_hourly_daily_query_1", [SUCCESS]),
+        # Hourly/daily subscription for a same keyword (daily doesn't see hourly data)
+        ("overlap_hourly_daily_query_2", [HOURLY_OUT_OF_RANGE]),
+        # Hourly/daily subscription for multiple keywords (including overlap case)
+        ("valid_daily_hourly_subscription_multiple_keyword_1", [SUCCESS, SUCCESS]),
+        # Query end time beyond the nanosecond timestamp range (year 5138)
+        ("far_future_end_time", [HOURLY_OUT_OF_RANGE]),
+    ]
+] + [
+    # No subscription for any requested keyword
+    (
+        "no_subscription_for_keyword",
+        REQUESTS["no_subscription_for_keyword"],
+        403,
+        "User doesn't have any subscriptions with keywords_id 3,2",
+    ),
+]
+
+
+def assert_query_result(
+    result, status_code: int, expected_status: int, expected_results
+) -> None:
+    """
+    Checks a `SearchVolumeService.execute_query_data` result against a case of
+    `CASES`. A string expected result is a message contained in the response,
+    otherwise the result of each requested keyword is checked in order.
+    """
+    assert status_code == expected_status
+    if isinstance(expected_results, str):
+        assert expected_results in result
+        return
+
+    assert len(result) == len(expected_results)
+    for keyword_result, expected in zip(result, expected_results):
+        assert keyword_result["error"] == expected["error"]
+        assert expected["status"] in keyword_result["status"]
+        if expected["error"]:
+            assert len(keyword_result["data"]) == 0
+        else:
+            assert len(keyword_result["data"]) > 0
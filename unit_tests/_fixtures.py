@@ -0,0 +1,180 @@
+"""
+Canned database data for the unit tests and a mocked `MySQLConnector` serving it,
+plus fake Redis clients for the subscription cache.
+
+The data mirrors the sample data inserted by `generated_data.py` (keywords, users
+subscriptions and search volumes), so the tests run without a MySQL instance.
+"""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import redis
+
+from models.mysql import MySQLConnector
+
+KEYWORDS = pd.DataFrame(
+    {
+        "KEYWORD_ID": range(1, 11),
+        "KEYWORD_NAME": [
+            "floating shelves",
+            "fireplace mantel",
+            "wall shelf",
+            "butcher block countertop",
+            "fireplace surround",
+            "work bench",
+            "countertop",
+            "work table",
+            "floating shelf",
+            "bed frame",
+        ],
+    }
+)
+
+# Subscription cases 1 -> 6 of `generate_subscribes_sample()`
+USERS_SUBSCRIPTION = pd.DataFrame(
+    [
+        (1, 1, "HOURLY", date(2025, 1, 1), date(2025, 1, 10)),
+        (1, 1, "HOURLY", date(2025, 1, 7), date(2025, 1, 20)),
+        (2, 5, "DAILY", date(2025, 1, 1), date(2025, 1, 12)),
+        (2, 5, "DAILY", date(2025, 1, 10), date(2025, 1, 25)),
+        (3, 1, "HOURLY", date(2025, 1, 1), date(2025, 1, 10)),
+        (3, 2, "HOURLY", date(2025, 1, 3), date(2025, 1, 15)),
+        (4, 6, "DAILY", date(2025, 1, 1), date(2025, 1, 10)),
+        (4, 7, "DAILY", date(2025, 1, 3), date(2025, 1, 15)),
+        (4, 8, "DAILY", date(2025, 1, 5), date(2025, 1, 12)),
+        (5, 2, "HOURLY", date(2025, 1, 1), date(2025, 1, 10)),
+        (5, 2, "DAILY", date(2025, 1, 4), date(2025, 1, 15)),
+        (6, 2, "HOURLY", date(2025, 1, 1), date(2025, 1, 12)),
+        (6, 3, "DAILY", date(2025, 1, 1), date(2025, 1, 15)),
+        (6, 4, "HOURLY", date(2025, 1, 5), date(2025, 1, 10)),
+        (6, 4, "HOURLY", date(2025, 1, 10), date(2025, 1, 18)),
+    ],
+    columns=["USER_ID", "KEYWORD_ID", "SUBSCRIPTION_TYPE", "START_TIME", "END_TIME"],
+)
+
+# Hourly search volumes of all keywords in 3 months
+_TIMESTAMPS = pd.date_range("2025-01-01 00:00:00", "2025-03-31 23:00:00", freq="H")
+KEYWORD_SEARCH_VOLUME = pd.DataFrame(
+    {
+        "KEYWORD_ID": np.repeat(KEYWORDS["KEYWORD_ID"].values, len(_TIMESTAMPS)),
+        "CREATED_DATETIME": np.tile(_TIMESTAMPS.values, len(KEYWORDS)),
+        "SEARCH_VOLUME": np.random.RandomState(42).randint(
+            100, 5000, size=len(KEYWORDS) * len(_TIMESTAMPS)
+        ),
+    }
+)
+
+# Daily search volumes (9:00 AM snapshot)
+_DAILY = KEYWORD_SEARCH_VOLUME[KEYWORD_SEARCH_VOLUME["CREATED_DATETIME"].dt.hour == 9]
+KEYWORD_SEARCH_VOLUME_DAILY = pd.DataFrame(
+    {
+        "KEYWORD_ID": _DAILY["KEYWORD_ID"].values,
+        "CREATED_DATE": _DAILY["CREATED_DATETIME"].dt.normalize().values,
+        "SEARCH_VOLUME": _DAILY["SEARCH_VOLUME"].values,
+    }
+)
+
+
+def _query_with_in_list_condition(
+    table_name: str, *column, **args
+) -> pd.DataFrame:
+    """
+    Fake `MySQLConnector.query_with_in_list_condition` over the fixture tables.
+    """
+    df = {"keywords": KEYWORDS, "users_subscription": USERS_SUBSCRIPTION}[
+        table_name.lower()
+    ]
+
+    mask = np.ones(len(df), dtype=bool)
+    for key, value in args.items():
+        values = value if isinstance(value, list) else [value]
+        # MySQL casts the values to the column type (e.g. "1" of the query string)
+        series = df[key.upper()]
+        mask &= series.isin(np.asarray(values).astype(series.dtype)).values
+
+    columns = [col.strip().upper() for col in ",".join(column).split(",") if col]
+    result = df[mask]
+    return result[columns] if len(columns) > 0 else result
+
+
+def _query_with_sql_command(sql: str, params: dict = None) -> pd.DataFrame:
+    """
+    Fake `MySQLConnector.query_with_sql_command`, only the `keywords` table lookup
+    is used by the service.
+    """
+    return KEYWORDS.copy()
+
+
+def _query_rows(sql: str, params: dict = None) -> list:
+    """
+    Fake `MySQLConnector.query_rows` for the search volume queries of the service.
+    The rows hold Python `int`/`datetime` values, like the rows of PyMySQL.
+    """
+    if "keyword_search_volume_daily" in sql:
+        df, time_col = KEYWORD_SEARCH_VOLUME_DAILY, "CREATED_DATE"
+    else:
+        df, time_col = KEYWORD_SEARCH_VOLUME, "CREATED_DATETIME"
+
+    start_time = pd.Timestamp(params["start_time"])
+    end_time = pd.Timestamp(params["end_time"])
+    result = df[
+        df["KEYWORD_ID"].isin(params["keywords_id"])
+        & df[time_col].between(start_time, end_time)
+    ]
+    result = result.sort_values(["KEYWORD_ID", time_col])
+    return [
+        {"KEYWORD_ID": keyword_id, time_col: created, "SEARCH_VOLUME": volume}
+        for keyword_id, created, volume in zip(
+            result["KEYWORD_ID"].tolist(),
+            result[time_col].dt.to_pydatetime(),
+            result["SEARCH_VOLUME"].tolist(),
+        )
+    ]
+
+
+def mock_mysql_connector() -> MagicMock:
+    """
+    Creates a mocked `MySQLConnector` serving the fixture tables.
+    """
+    mysql = MagicMock(spec=MySQLConnector)
+    mysql.query_with_in_list_condition.side_effect = _query_with_in_list_condition
+    mysql.query_with_sql_command.side_effect = _query_with_sql_command
+    mysql.query_rows.side_effect = _query_rows
+    return mysql
+
+
+class FakeRedis:
+    """
+    In-memory stand-in of the `redis.Redis` commands used by the service.
+    """
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.ttl = {}
+
+    def get(self, key: str):
+        return self.data.get(key)
+
+    def mget(self, keys: list) -> list:
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key: str, ttl: int, value: bytes) -> None:
+        self.data[key] = bytes(value)
+        self.ttl[key] = ttl
+
+    def delete(self, *keys) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class BrokenRedis:
+    """
+    Redis client failing every command, like an unreachable server.
+    """
+
+    def _fail(self, *args, **kwargs):
+        raise redis.ConnectionError("Connection refused")
+
+    get = mget = setex = delete = _fail
@@ -0,0 +1,77 @@
+import warnings
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+import app
+from services.search_vols import SearchVolumeService
+from test_support.cases import REQUESTS
+from unit_tests._fixtures import mock_mysql_connector
+
+warnings.filterwarnings("ignore")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Serve the route from the mocked connector and an in-memory response cache
+    app.cache.init_app(app.app, config={"CACHE_TYPE": "SimpleCache"})
+    app.cache.clear()
+    service = MagicMock(wraps=SearchVolumeService(mock_mysql_connector()))
+    monkeypatch.setattr(app, "service", service)
+    yield service
+    app.cache.clear()
+
+
+@pytest.fixture
+def client(service):
+    return app.app.test_client()
+
+
+def test_query_success_json_response(client):
+    """
+    Test a successful query is serialized by `json_response`, with the datetimes
+    of the search volumes as ISO 8601 strings.
+    """
+    query = dict(REQUESTS["valid_hourly_subscription_single_keyword_1"])
+    response = client.get("/query", query_string=query)
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+
+    body = orjson.loads(response.data)
+    assert body["success"] is True
+    assert body["message"] == "Query executed successfully"
+    assert len(body["search_volume"]) == 1
+
+    data = body["search_volume"][0]["data"]
+    assert len(data) > 0
+    assert data[0]["CREATED_DATETIME"] == "2025-01-01T00:00:00"
+    assert isinstance(data[0]["SEARCH_VOLUME"], int)
+
+
+def test_query_success_is_cached(client, service):
+    """
+    Test identical successful queries are served from the response cache.
+    """
+    query = dict(REQUESTS["valid_daily_subscription_single_keyword_1"])
+    first = client.get("/query", query_string=query)
+    second = client.get("/query", query_string=query)
+
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert service.execute_query_data.call_count == 1
+
+
+def test_query_error_is_not_cached(client, service):
+    """
+    Test failed queries are not cached, each request runs the query again.
+    """
+    query = dict(REQUESTS["input_validation_failed_1"])
+    for _ in range(2):
+        response = client.get("/query", query_string=query)
+        assert response.status_code == 400
+        body = orjson.loads(response.data)
+        assert body["success"] is False
+        assert body["message"] == "Validation failed"
+
+    assert service.execute_query_data.call_count == 2
@@ -1,669 +1,423 @@
-import unittest
+import functools
 import warnings
-from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch
+from datetime import date
+from types import MappingProxyType
 
+import numpy as np
 import pandas as pd
-import yaml
-
-from models.mysql import MySQLConnector
-from services.search_vols import SearchVolumeService
-
-
-class TestSearchVolumeService(unittest.TestCase):
-    def setUp(self):
-        warnings.filterwarnings("ignore")
-        with open("config.yml", encoding="utf-8") as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
-
-        mysql = MySQLConnector(config["MYSQL_CONNECT"])
-        self.service = SearchVolumeService(mysql)
-
-    # ======================== Input Validation Tests ===============================
-    def test_validate_input_missing_fields(self):
-        # Test case: Missing required fields (e.g., timing, start_time, end_time)
-        request = {"user_id": 1, "keywords_id": "1,2"}
-        valid, errors = self.service._validate_input(request)
-        self.assertFalse(valid)
-        self.assertIn("Missing required fields timing, start_time, end_time", errors)
-
-    def test_validate_input_invalid_timing(self):
-        # Test case: Invalid timing value (not HOURLY or DAILY)
-        request = {
-            "user_id": 1,
-            "keywords_id": "1,2",
-            "timing": "MONTHLY",
-            "start_time": "1609459200",
-            "end_time": "1609545600",
-        }
-        valid, errors = self.service._validate_input(request)
-        self.assertFalse(valid)
-        self.assertEqual(errors, "Only support 'HOURLY' and 'DAILY' timing.")
-
-    def test_validate_input_valid(self):
-        # Test case: Valid input with all required fields
-        request = {
-            "user_id": 1,
-            "keywords_id": "1,2",
-            "timing": "DAILY",
-            "start_time": "1609459200",
-            "end_time": "1609545600",
-        }
-        valid, errors = self.service._validate_input(request)
-        self.assertTrue(valid)
-        self.assertEqual(errors, "")
-
-    # ======================== Query Time Range Tests ===============================
-    def test_check_query_time_range_within_range(self):
-        # Test case: Query time range fully within subscription range
-        start_time = datetime(2025, 1, 5, tzinfo=timezone.utc)
-        end_time = datetime(2025, 1, 8, tzinfo=timezone.utc)
-        subscription_range = [
-            {
-                "START_TIME": datetime(2025, 1, 1, tzinfo=timezone.utc),
-                "END_TIME": datetime(2025, 1, 4, tzinfo=timezone.utc),
-            },
-            {
-                "START_TIME": datetime(2025, 1, 5, tzinfo=timezone.utc),
-                "END_TIME": datetime(2025, 1, 10, tzinfo=timezone.utc),
-            },
-        ]
-        result = self.service._check_query_time_range(
-            start_time, end_time, subscription_range
-        )
-        self.assertTrue(result)
-
-    def test_check_query_time_range_outside_range(self):
-        # Test case: Query time range outside subscription range
-        start_time = datetime(2025, 1, 5, tzinfo=timezone.utc)
-        end_time = datetime(2025, 1, 6, tzinfo=timezone.utc)
-        subscription_range = [
-            {
-                "START_TIME": datetime(2025, 1, 1, tzinfo=timezone.utc),
-                "END_TIME": datetime(2025, 1, 4, tzinfo=timezone.utc),
-            },
-            {
-                "START_TIME": datetime(2025, 1, 7, tzinfo=timezone.utc),
-                "END_TIME": datetime(2025, 1, 10, tzinfo=timezone.utc),
-            },
-        ]
-        result = self.service._check_query_time_range(
-            start_time, end_time, subscription_range
-        )
-        self.assertFalse(result)
-
-    # ======================== Subscription Union Tests ===============================
-    def test_union_subscription_time_overlapping(self):
-        # Test case: Overlapping subscription time ranges
-        df = pd.DataFrame(
-            {
-                "START_TIME": [
-                    datetime(2023, 1, 1, tzinfo=timezone.utc),
-                    datetime(2023, 1, 3, tzinfo=timezone.utc),
-                ],
-                "END_TIME": [
-                    datetime(2023, 1, 4, tzinfo=timezone.utc),
-                    datetime(2023, 1, 5, tzinfo=timezone.utc),
-                ],
-            }
-        )
-        merged = self.service._union_subscription_time(df)
-        self.assertEqual(len(merged), 1)
-        self.assertEqual(
-            merged.iloc[0]["START_TIME"], datetime(2023, 1, 1, tzinfo=timezone.utc)
-        )
-        self.assertEqual(
-            merged.iloc[0]["END_TIME"], datetime(2023, 1, 5, tzinfo=timezone.utc)
-        )
-
-    def test_union_subscription_time_non_overlapping(self):
-        # Test case: Non-overlapping subscription time ranges
-        df = pd.DataFrame(
-            {
-                "START_TIME": [
-                    datetime(2023, 1, 1, tzinfo=timezone.utc),
-                    datetime(2023, 1, 5, tzinfo=timezone.utc),
-                ],
-                "END_TIME": [
-                    datetime(2023, 1, 2, tzinfo=timezone.utc),
-                    datetime(2023, 1, 6, tzinfo=timezone.utc),
-                ],
-            }
-        )
-        merged = self.service._union_subscription_time(df)
-        self.assertEqual(len(merged), 2)
-
-    # ======================== Subscription Validation Tests ===============================
-    def test_check_user_subscriptions_no_hourly_subscription(self):
-        # Test case: Hourly query with no hourly subscription
-        params = {
-            "timing": "HOURLY",
-            "start_time": datetime(2023, 1, 2, tzinfo=timezone.utc),
-            "end_time": datetime(2023, 1, 3, tzinfo=timezone.utc),
-        }
-        user_subs = pd.DataFrame({"SUBSCRIPTION_TYPE": ["DAILY"]})
-        valid, status = self.service._check_user_subscriptions(params, user_subs)
-        self.assertFalse(valid)
-        self.assertEqual(status, "Hourly data requires an hourly subscription")
-
-    def test_check_user_subscriptions_valid_hourly(self):
-        # Test case: Valid hourly subscription and time range
-        params = {
-            "timing": "HOURLY",
-            "start_time": datetime(2023, 1, 2, tzinfo=timezone.utc),
-            "end_time": datetime(2023, 1, 3, tzinfo=timezone.utc),
-        }
-        user_subs = pd.DataFrame(
-            {
-                "SUBSCRIPTION_TYPE": ["HOURLY"],
-                "START_TIME": [datetime(2023, 1, 1, tzinfo=timezone.utc)],
-                "END_TIME": [datetime(2023, 1, 4, tzinfo=timezone.utc)],
-            }
-        )
-        valid, status = self.service._check_user_subscriptions(params, user_subs)
-        self.assertTrue(valid)
-        self.assertIsNone(status)
-
-    def test_check_user_subscriptions_invalid_time_range(self):
-        # Test case: Daily query with time range outside subscription
-        params = {
-            "timing": "DAILY",
-            "start_time": datetime(2023, 1, 5, tzinfo=timezone.utc),
-            "end_time": datetime(2023, 1, 6, tzinfo=timezone.utc),
-        }
-        user_subs = pd.DataFrame(
-            {
-                "SUBSCRIPTION_TYPE": ["DAILY"],
-                "START_TIME": [datetime(2023, 1, 1, tzinfo=timezone.utc)],
-                "END_TIME": [datetime(2023, 1, 4, tzinfo=timezone.utc)],
-            }
-        )
-        valid, status = self.service._check_user_subscriptions(params, user_subs)
-        self.assertFalse(valid)
-        self.assertEqual(
-            status, "DAILY query time range is out of subscription time range."
-        )
-
-    # =================================================================
-    # | -------------------- FULL QUERY FLOW TEST --------------------|
-    # =================================================================
-
-    # ===================== Input validation test =====================
-    def test_input_validation_failed_1(self):
-        """
-        Test input validation failed (missing required fields)
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "timing": "HOURLY",
-        }
-        errors, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 400)
-        self.assertIn("Missing required fields start_time, end_time", errors)
-
-    def test_input_validation_failed_2(self):
-        """
-        Test input validation failed (missing required fields)
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "start_time": "1672531200",
-            "end_time": "1672790400",
-        }
-        errors, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 400)
-        self.assertIn("Missing required fields timing", errors)
-
-    def test_input_validation_failed_3(self):
-        """
-        Test input validation failed (timing is not 'HOURLY' or 'DAILY')
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "timing": "MONTHLY",
-            "start_time": "1672531200",
-            "end_time": "1672790400",
-        }
-        errors, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 400)
-        self.assertIn("Only support 'HOURLY' and 'DAILY' timing.", errors)
-
-    def test_input_validation_failed_4(self):
-        """
-        Test input validation failed (invalid timestamp format)
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "timing": "DAILY",
-            "start_time": "Khang",
-            "end_time": "1672790400",
-        }
-        errors, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 500)
-        self.assertIn(
-            "Internal Server Error. Details: invalid literal for int() with base 10: 'Khang'",
-            errors,
-        )
-
-    # =================== No/Insufficient subscription test =====================
-    def test_no_subscription_for_keyword(self):
-        """
-        Test query with no subscription for the keyword.
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "3,2",
-            "timing": "DAILY",
-            "start_time": "1672531200",
-            "end_time": "1672790400",
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 403)
-        self.assertIn(
-            f"User doesn't have any subscriptions with keywords_id {request['keywords_id']}",
-            result,
-        )
-
-    def test_insufficient_subscription_type(self):
-        """
-        Test HOURLY query with only DAILY subscription.
-        """
-        request = {
-            "user_id": 2,
-            "keywords_id": "5",
-            "timing": "HOURLY",
-            "start_time": "1672531200",
-            "end_time": "1736899200",
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertTrue(result[0]["error"])
-        self.assertIn(
-            "Hourly data requires an hourly subscription", result[0]["status"]
-        )
-
-    # ================= Hourly Subscription for a Single Keyword test =====================
-    def test_valid_hourly_subscription_single_keyword_1(self):
-        """
-        Test valid hourly subscription with single_keyword (non-overlap subscription time)
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "timing": "HOURLY",
-            "start_time": "1735689600",  # 2025-01-01
-            "end_time": "1736035200",  # 2025-01-05
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertFalse(result[0]["error"])
-        self.assertIn("Successful", result[0]["status"])
-        self.assertGreater(len(result[0]["data"]), 0)
-
-    def test_valid_hourly_subscription_single_keyword_2(self):
-        """
-        Test valid hourly subscription with single_keyword (overlap subscription time)
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "timing": "HOURLY",
-            "start_time": "1736294400",  # 2025-01-08
-            "end_time": "1736985600",  # 2025-01-16
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertFalse(result[0]["error"])
-        self.assertIn("Successful", result[0]["status"])
-        self.assertGreater(len(result[0]["data"]), 0)
-
-    def test_invalid_hourly_subscription_single_keyword(self):
-        """
-        Test invalid hourly subscription with single_keyword (out of subscription time)
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "timing": "HOURLY",
-            "start_time": "1736985600",  # 2025-01-16
-            "end_time": "1737763200",  # 2025-01-25
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertTrue(result[0]["error"])
-        self.assertIn(
-            "HOURLY query time range is out of subscription time range.",
-            result[0]["status"],
-        )
-        self.assertEqual(len(result[0]["data"]), 0)
-
-    # ================= Daily Subscription for a Single Keyword test =====================
-    def test_valid_daily_subscription_single_keyword_1(self):
-        """
-        Test valid daily subscription with single_keyword (non-overlap subscription time)
-        """
-        request = {
-            "user_id": 2,
-            "keywords_id": "5",
-            "timing": "DAILY",
-            "start_time": "1735689600",  # 2025-01-01
-            "end_time": "1736035200",  # 2025-01-05
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertFalse(result[0]["error"])
-        self.assertIn("Successful", result[0]["status"])
-        self.assertGreater(len(result[0]["data"]), 0)
-
-    def test_valid_daily_subscription_single_keyword_2(self):
-        """
-        Test valid daily subscription with single_keyword (overlap subscription time)
-        """
-        request = {
-            "user_id": 2,
-            "keywords_id": "5",
-            "timing": "DAILY",
-            "start_time": "1735689600",  # 2025-01-01
-            "end_time": "1737331200",  # 2025-01-20
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertFalse(result[0]["error"])
-        self.assertIn("Successful", result[0]["status"])
-        self.assertGreater(len(result[0]["data"]), 0)
-
-    def test_invalid_daily_subscription_single_keyword(self):
-        """
-        Test invalid daily subscription with single_keyword (out of subscription time)
-        """
-        request = {
-            "user_id": 1,
-            "keywords_id": "1",
-            "timing": "DAILY",
-            "start_time": "1737763200",  # 2025-01-25
-            "end_time": "1738195200",  # 2025-01-30
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertTrue(result[0]["error"])
-        self.assertIn(
-            "DAILY query time range is out of subscription time range.",
-            result[0]["status"],
-        )
-        self.assertEqual(len(result[0]["data"]), 0)
-
-    # ================ Hourly Subscription for a Multiple Keywords test =====================
-    def test_valid_hourly_subscription_multiple_keyword_1(self):
-        """
-        Test valid hourly subscription with multiple keyword.
-        (2 keywords are valid subscription time)
-        """
-        request = {
-            "user_id": 3,
-            "keywords_id": "1,2",
+import pytest
+
+from services.search_vols import SUBSCRIPTION_CACHE_TTL, SearchVolumeService
+from test_support.cases import (
+    CASES,
+    HOURLY_OUT_OF_RANGE,
+    MSG_NO_HOURLY,
+    MSG_OOR,
+    NO_HOURLY_SUBSCRIPTION,
+    REQUESTS,
+    SUCCESS,
+    assert_query_result,
+)
+from unit_tests import _fixtures
+from unit_tests._fixtures import BrokenRedis, FakeRedis, mock_mysql_connector
+
+warnings.filterwarnings("ignore")
+
+
+@functools.lru_cache(maxsize=None)
+def _utc(year: int, month: int, day: int, hour: int = 0) -> pd.Timestamp:
+    """
+    Build a UTC timestamp once, later calls with the same date return the cached one.
+    """
+    return pd.Timestamp(year=year, month=month, day=day, hour=hour, tz="UTC")
+
+
+# Record layout of the subscription fixtures
+_SUBSCRIPTION_DTYPE = np.dtype(
+    [
+        ("SUBSCRIPTION_TYPE", "U6"),
+        ("START_TIME", "datetime64[ns]"),
+        ("END_TIME", "datetime64[ns]"),
+    ]
+)
+
+
+def _subscription_frame(
+    start_times: list, end_times: list, subscription_type: str = None
+) -> pd.DataFrame:
+    """
+    Build a subscription DataFrame with "START_TIME"/"END_TIME" as datetime64[ns, UTC]
+    columns (and "SUBSCRIPTION_TYPE" when given).
+    """
+    records = np.array(
+        [
+            (subscription_type or "", start_time, end_time)
+            for start_time, end_time in zip(start_times, end_times)
+        ],
+        dtype=_SUBSCRIPTION_DTYPE,
+    )
+    df = pd.DataFrame.from_records(
+        records, exclude=["SUBSCRIPTION_TYPE"] if subscription_type is None else None
+    )
+    return df.assign(
+        START_TIME=df["START_TIME"].dt.tz_localize("UTC"),
+        END_TIME=df["END_TIME"].dt.tz_localize("UTC"),
+    )
+
+
+# Subscription ranges, subscription DataFrames and query params of the method tests,
+# built once at import time. The methods under test only read them.
+_RANGES = {
+    "within_range": (
+        pd.to_datetime(["2025-01-01", "2025-01-05"], utc=True).asi8 // 10**9,
+        pd.to_datetime(["2025-01-04", "2025-01-10"], utc=True).asi8 // 10**9,
+    ),
+    "outside_range": (
+        pd.to_datetime(["2025-01-01", "2025-01-07"], utc=True).asi8 // 10**9,
+        pd.to_datetime(["2025-01-04", "2025-01-10"], utc=True).asi8 // 10**9,
+    ),
+}
+
+_SUBS = {
+    "overlapping": _subscription_frame(
+        ["2023-01-01", "2023-01-03"], ["2023-01-04", "2023-01-05"]
+    ),
+    "non_overlapping": _subscription_frame(
+        ["2023-01-01", "2023-01-05"], ["2023-01-02", "2023-01-06"]
+    ),
+    "unsorted": _subscription_frame(
+        ["2023-01-05", "2023-01-01", "2023-01-03"],
+        ["2023-01-06", "2023-01-02", "2023-01-05"],
+    ),
+    "daily_only": pd.DataFrame({"SUBSCRIPTION_TYPE": ["DAILY"]}),
+    "hourly_jan_1_4": _subscription_frame(["2023-01-01"], ["2023-01-04"], "HOURLY"),
+    "daily_jan_1_4": _subscription_frame(["2023-01-01"], ["2023-01-04"], "DAILY"),
+}
+
+_PARAMS = {
+    "hourly_jan_2_3": MappingProxyType(
+        {
             "timing": "HOURLY",
-            "start_time": "1736035200",  # 2025-01-05
-            "end_time": "1736467200",  # 2025-01-10
+            "start_time": _utc(2023, 1, 2),
+            "end_time": _utc(2023, 1, 3),
         }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-
-        # First keyword result
-        result_1 = result[0]
-        self.assertFalse(result_1["error"])
-        self.assertIn("Successful", result_1["status"])
-        self.assertGreater(len(result_1["data"]), 0)
-
-        # Second keyword result
-        result_2 = result[1]
-        self.assertFalse(result_2["error"])
-        self.assertIn("Successful", result_2["status"])
-        self.assertGreater(len(result_2["data"]), 0)
-
-    def test_valid_hourly_subscription_multiple_keyword_2(self):
-        """
-        Test valid hourly subscription with multiple keyword.
-        (1 keywords is valid subscription time, otherwise is not)
-        """
-        request = {
-            "user_id": 3,
-            "keywords_id": "1,2",
-            "timing": "HOURLY",
-            "start_time": "1736467200",  # 2025-01-10
-            "end_time": "1736899200",  # 2025-01-15
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-
-        # First keyword result
-        result_1 = result[0]
-        self.assertTrue(result_1["error"])
-        self.assertIn(
-            "HOURLY query time range is out of subscription time range.",
-            result_1["status"],
-        )
-        self.assertEqual(len(result_1["data"]), 0)
-
-        # Second keyword result
-        result_2 = result[1]
-        self.assertFalse(result_2["error"])
-        self.assertIn("Successful", result_2["status"])
-        self.assertGreater(len(result_2["data"]), 0)
-
-    def test_invalid_hourly_subscription_multiple_keyword(self):
-        """
-        Test invalid hourly subscription with multiple keyword.
-        (2 keywords is invalid subscription time)
-        """
-        request = {
-            "user_id": 3,
-            "keywords_id": "1,2",
-            "timing": "HOURLY",
-            "start_time": "1738368000",  # 2025-02-01
-            "end_time": "1738454400",  # 2025-02-02
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-
-        # First keyword result
-        result_1 = result[0]
-        self.assertTrue(result_1["error"])
-        self.assertIn(
-            "HOURLY query time range is out of subscription time range.",
-            result_1["status"],
-        )
-        self.assertEqual(len(result_1["data"]), 0)
-
-        # Second keyword result
-        result_2 = result[1]
-        self.assertTrue(result_2["error"])
-        self.assertIn(
-            "HOURLY query time range is out of subscription time range.",
-            result_2["status"],
-        )
-        self.assertEqual(len(result_2["data"]), 0)
-
-    # ================ Daily Subscription for a Multiple Keywords test =====================
-    def test_valid_daily_subscription_multiple_keyword_1(self):
-        """
-        Test valid daily subscription with multiple keyword.
-        (2 keywords are valid subscription time)
-        """
-        request = {
-            "user_id": 4,
-            "keywords_id": "6,7,8",
+    ),
+    "daily_jan_5_6": MappingProxyType(
+        {
             "timing": "DAILY",
-            "start_time": "1736035200",  # 2025-01-05
-            "end_time": "1736121600",  # 2025-01-06
+            "start_time": _utc(2023, 1, 5),
+            "end_time": _utc(2023, 1, 6),
         }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-
-        # First keyword result
-        result_1 = result[0]
-        self.assertFalse(result_1["error"])
-        self.assertIn("Successful", result_1["status"])
-        self.assertGreater(len(result_1["data"]), 0)
-
-        # Second keyword result
-        result_2 = result[1]
-        self.assertFalse(result_2["error"])
-        self.assertIn("Successful", result_2["status"])
-        self.assertGreater(len(result_2["data"]), 0)
-
-        # Third keyword result
-        result_3 = result[2]
-        self.assertFalse(result_3["error"])
-        self.assertIn("Successful", result_3["status"])
-        self.assertGreater(len(result_3["data"]), 0)
-
-    def test_valid_daily_subscription_multiple_keyword_2(self):
-        """
-        Test valid daily subscription with multiple keyword.
-        (2 keywords are valid subscription time, 1 invalid)
-        """
-        request = {
-            "user_id": 4,
-            "keywords_id": "6,7,8",
-            "timing": "DAILY",
-            "start_time": "1736553600",  # 2025-01-11
-            "end_time": "1736640000",  # 2025-01-12
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-
-        # First keyword result
-        result_1 = result[0]
-        self.assertTrue(result_1["error"])
-        self.assertIn(
-            "DAILY query time range is out of subscription time range.",
-            result_1["status"],
-        )
-        self.assertEqual(len(result_1["data"]), 0)
-
-        # Second keyword result
-        result_2 = result[1]
-        self.assertFalse(result_2["error"])
-        self.assertIn("Successful", result_2["status"])
-        self.assertGreater(len(result_2["data"]), 0)
-
-        # Third keyword result
-        result_3 = result[2]
-        self.assertFalse(result_3["error"])
-        self.assertIn("Successful", result_3["status"])
-        self.assertGreater(len(result_3["data"]), 0)
-
-    def test_valid_daily_subscription_multiple_keyword_3(self):
-        """
-        Test valid daily subscription with multiple keyword.
-        (3 keywords are invalid subscription time)
-        """
-        request = {
-            "user_id": 4,
-            "keywords_id": "6,7,8",
-            "timing": "DAILY",
-            "start_time": "1738368000",  # 2025-02-01
-            "end_time": "1738454400",  # 2025-02-02
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-
-        # First keyword result
-        result_1 = result[0]
-        self.assertTrue(result_1["error"])
-        self.assertIn(
-            "DAILY query time range is out of subscription time range.",
-            result_1["status"],
-        )
-        self.assertEqual(len(result_1["data"]), 0)
-
-        # Second keyword result
-        result_2 = result[1]
-        self.assertTrue(result_2["error"])
-        self.assertIn(
-            "DAILY query time range is out of subscription time range.",
-            result_2["status"],
-        )
-        self.assertEqual(len(result_2["data"]), 0)
-
-        # Third keyword result
-        result_3 = result[2]
-        self.assertTrue(result_3["error"])
-        self.assertIn(
-            "DAILY query time range is out of subscription time range.",
-            result_3["status"],
-        )
-        self.assertEqual(len(result_3["data"]), 0)
-
-    # ========== Hourly/Daily Subscription for a Same Keyword test =====================
-    def test_overlap_hourly_daily_query_1(self):
-        """
-        Test overlap hourly/daily query with single keyword.
-        (subscribe hourly will see the daily data)
-        """
-        request = {
-            "user_id": 5,
-            "keywords_id": "2",
-            "timing": "DAILY",
-            "start_time": "1735689600",  # 2025-01-01
-            "end_time": "1735948800",  # 2025-01-04
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertFalse(result[0]["error"])
-        self.assertIn("Successful", result[0]["status"])
-        self.assertGreater(len(result[0]["data"]), 0)
-
-    def test_overlap_hourly_daily_query_2(self):
-        """
-        Test overlap hourly/daily query with single keyword.
-        (subscribe daily will not see data hourly)
-        """
-        request = {
-            "user_id": 5,
-            "keywords_id": "2",
-            "timing": "HOURLY",
-            "start_time": "1736726400",  # 2025-01-13
-            "end_time": "1736899200",  # 2025-01-15
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-        self.assertTrue(result[0]["error"])
-        self.assertIn("HOURLY query time range is out of subscription time range.", result[0]["status"])
-        self.assertEqual(len(result[0]["data"]), 0)
-
-    # ========== Hourly/Daily Subscription for Multiple Keywords test =====================
-    def test_valid_daily_hourly_subscription_multiple_keyword_1(self):
-        """
-        Test valid daily subscription with multiple keyword (including overlap case).
-        """
-        request = {
-            "user_id": 6,
-            "keywords_id": "2,4",
-            "timing": "HOURLY",
-            "start_time": "1736035200",  # 2025-01-05
-            "end_time": "1736640000",  # 2025-01-12
-        }
-        result, status_code = self.service.execute_query_data(request)
-        self.assertEqual(status_code, 200)
-
-        # First keyword result
-        result_1 = result[0]
-        self.assertFalse(result_1["error"])
-        self.assertIn("Successful", result_1["status"])
-        self.assertGreater(len(result_1["data"]), 0)
-
-        # Second keyword result
-        result_2 = result[1]
-        self.assertFalse(result_2["error"])
-        self.assertIn("Successful", result_2["status"])
-        self.assertGreater(len(result_2["data"]), 0)
-
-
-
-if __name__ == "__main__":
-    unittest.main()
+    ),
+}
+
+
+@pytest.fixture(scope="session")
+def service():
+    # Create the mocked connector once, shared by all tests. It serves the sample
+    # data of `generated_data.py`, see `integration_tests/` for the live database.
+    mysql = mock_mysql_connector()
+    service = SearchVolumeService(mysql)
+    yield service
+    mysql.dispose_engine()
+
+
+# ======================== Input Validation Tests ===============================
+def test_validate_input_missing_fields(service):
+    # Test case: Missing required fields (e.g., timing, start_time, end_time)
+    query = REQUESTS["validate_input_missing_fields"]
+    valid, errors = service._validate_input(query)
+    assert not valid
+    assert "Missing required fields timing, start_time, end_time" in errors
+
+
+def test_validate_input_invalid_timing(service):
+    # Test case: Invalid timing value (not HOURLY or DAILY)
+    query = REQUESTS["validate_input_invalid_timing"]
+    valid, errors = service._validate_input(query)
+    assert not valid
+    assert errors == "Only support 'HOURLY' and 'DAILY' timing."
+
+
+def test_validate_input_valid(service):
+    # Test case: Valid input with all required fields
+    query = REQUESTS["validate_input_valid"]
+    assert service._validate_input(query) == (True, "")
+
+
+# ======================== Query Time Range Tests ===============================
+def test_check_query_time_range_within_range(service):
+    # Test case: Query time range fully within subscription range
+    start_time = int(_utc(2025, 1, 5).timestamp())
+    end_time = int(_utc(2025, 1, 8).timestamp())
+    subscription_range = _RANGES["within_range"]
+    assert service._check_query_time_range(start_time, end_time, subscription_range)
+
+
+def test_check_query_time_range_outside_range(service):
+    # Test case: Query time range outside subscription range
+    start_time = int(_utc(2025, 1, 5).timestamp())
+    end_time = int(_utc(2025, 1, 6).timestamp())
+    subscription_range = _RANGES["outside_range"]
+    assert not service._check_query_time_range(
+        start_time, end_time, subscription_range
+    )
+
+
+# ======================== Subscription Union Tests ===============================
+def test_union_subscription_time_overlapping(service):
+    # Test case: Overlapping subscription time ranges
+    merged = service._union_subscription_time(_SUBS["overlapping"])
+    assert len(merged) == 1
+    assert merged.iloc[0]["START_TIME"] == pd.Timestamp("2023-01-01", tz="UTC")
+    assert merged.iloc[0]["END_TIME"] == pd.Timestamp("2023-01-05", tz="UTC")
+
+
+def test_union_subscription_time_non_overlapping(service):
+    # Test case: Non-overlapping subscription time ranges
+    merged = service._union_subscription_time(_SUBS["non_overlapping"])
+    assert len(merged) == 2
+
+
+def test_union_subscription_time_unsorted(service):
+    # Test case: Subscription time ranges not ordered by start time
+    merged = service._union_subscription_time(_SUBS["unsorted"])
+    assert len(merged) == 2
+    assert merged["START_TIME"].tolist() == [
+        pd.Timestamp("2023-01-01", tz="UTC"),
+        pd.Timestamp("2023-01-03", tz="UTC"),
+    ]
+    assert merged["END_TIME"].tolist() == [
+        pd.Timestamp("2023-01-02", tz="UTC"),
+        pd.Timestamp("2023-01-06", tz="UTC"),
+    ]
+
+
+# ======================== Subscription Validation Tests ===============================
+def test_check_subscription_range_no_hourly_subscription(service):
+    # Test case: Hourly query with no hourly subscription
+    params = _PARAMS["hourly_jan_2_3"]
+    user_subs = _SUBS["daily_only"]
+    subscription_range = service._merge_subscription_range(params["timing"], user_subs)
+    valid, status = service._check_subscription_range(params, subscription_range)
+    assert not valid
+    assert status == MSG_NO_HOURLY
+
+
+def test_check_subscription_range_valid_hourly(service):
+    # Test case: Valid hourly subscription and time range
+    params = _PARAMS["hourly_jan_2_3"]
+    user_subs = _SUBS["hourly_jan_1_4"]
+    subscription_range = service._merge_subscription_range(params["timing"], user_subs)
+    valid, status = service._check_subscription_range(params, subscription_range)
+    assert valid
+    assert status is None
+
+
+def test_check_subscription_range_invalid_time_range(service):
+    # Test case: Daily query with time range outside subscription
+    params = _PARAMS["daily_jan_5_6"]
+    user_subs = _SUBS["daily_jan_1_4"]
+    subscription_range = service._merge_subscription_range(params["timing"], user_subs)
+    valid, status = service._check_subscription_range(params, subscription_range)
+    assert not valid
+    assert status == f"DAILY {MSG_OOR}"
+
+
+# ======================== Subscription Cache Tests ===============================
+def _cached_service(cache) -> SearchVolumeService:
+    # A fresh service per test, the cache state is not shared between tests
+    return SearchVolumeService(mock_mysql_connector(), cache=cache)
+
+
+def test_subscription_cache_miss():
+    # Test case: Ranges missing from the cache are merged from MySQL and cached
+    cache = FakeRedis()
+    service = _cached_service(cache)
+    result, status_code = service.execute_query_data(
+        REQUESTS["valid_hourly_subscription_multiple_keyword_1"]
+    )
+    assert_query_result(result, status_code, 200, [SUCCESS, SUCCESS])
+    assert service.mysql.query_with_in_list_condition.call_count == 1
+    assert sorted(cache.data) == ["subs:3:1:HOURLY", "subs:3:2:HOURLY"]
+    assert set(cache.ttl.values()) == {SUBSCRIPTION_CACHE_TTL}
+
+
+def test_subscription_cache_hit():
+    # Test case: Cached ranges skip the `users_subscription` query
+    query = REQUESTS["valid_hourly_subscription_multiple_keyword_1"]
+    service = _cached_service(FakeRedis())
+    expected = service.execute_query_data(query)
+    assert service.execute_query_data(query) == expected
+    assert service.mysql.query_with_in_list_condition.call_count == 1
+
+
+def test_subscription_cache_partial_hit():
+    # Test case: Only the keywords missing from the cache are queried
+    query = REQUESTS["valid_hourly_subscription_multiple_keyword_2"]
+    service = _cached_service(FakeRedis())
+    service.execute_query_data({**query, "keywords_id": "1"})
+    result, status_code = service.execute_query_data(query)
+    assert_query_result(result, status_code, 200, [HOURLY_OUT_OF_RANGE, SUCCESS])
+    last_call = service.mysql.query_with_in_list_condition.call_args
+    assert last_call.kwargs["keyword_id"] == [2]
+
+
+def test_subscription_cache_no_hourly_subscription():
+    # Test case: An empty range is cached for a keyword without hourly subscription
+    query = REQUESTS["insufficient_subscription_type"]
+    service = _cached_service(FakeRedis())
+    for _ in range(2):
+        result, status_code = service.execute_query_data(query)
+        assert_query_result(result, status_code, 200, [NO_HOURLY_SUBSCRIPTION])
+    assert service.mysql.query_with_in_list_condition.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "name, expected_results",
+    [
+        ("valid_hourly_subscription_multiple_keyword_1", [SUCCESS, SUCCESS]),
+        ("insufficient_subscription_type", [NO_HOURLY_SUBSCRIPTION]),
+    ],
+)
+def test_subscription_cache_error_fallback(name, expected_results):
+    # Test case: Redis errors fall back to merging the ranges from MySQL
+    service = _cached_service(BrokenRedis())
+    result, status_code = service.execute_query_data(REQUESTS[name])
+    assert_query_result(result, status_code, 200, expected_results)
+    assert service.mysql.query_with_in_list_condition.call_count == 1
+
+
+def test_subscription_cache_payload_round_trip(service):
+    # Test case: Cache payloads decode to the encoded ranges (far-future included)
+    subscription_range = (
+        np.array([1735689600, 1736553600], dtype=np.int64),
+        np.array([1736035200, 99999999999], dtype=np.int64),
+    )
+    payload = service._encode_subscription_range(subscription_range)
+    starts, ends = service._decode_subscription_range(payload)
+    np.testing.assert_array_equal(starts, subscription_range[0])
+    np.testing.assert_array_equal(ends, subscription_range[1])
+
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    starts, ends = service._decode_subscription_range(
+        service._encode_subscription_range(empty)
+    )
+    assert len(starts) == len(ends) == 0
+
+
+def test_invalidate_subscription_cache(monkeypatch):
+    # Test case: A new subscription is only seen after invalidating the cache
+    query = REQUESTS["hourly_after_subscription_end"]
+    service = _cached_service(FakeRedis())
+    result, status_code = service.execute_query_data(query)
+    assert_query_result(result, status_code, 200, [HOURLY_OUT_OF_RANGE])
+
+    new_subscription = pd.DataFrame(
+        [(1, 1, "HOURLY", date(2025, 1, 15), date(2025, 2, 1))],
+        columns=_fixtures.USERS_SUBSCRIPTION.columns,
+    )
+    monkeypatch.setattr(
+        _fixtures,
+        "USERS_SUBSCRIPTION",
+        pd.concat([_fixtures.USERS_SUBSCRIPTION, new_subscription]),
+    )
+
+    # Stale cached ranges until the subscriptions are invalidated
+    result, status_code = service.execute_query_data(query)
+    assert_query_result(result, status_code, 200, [HOURLY_OUT_OF_RANGE])
+
+    service.invalidate_subscription_cache(1, 1)
+    result, status_code = service.execute_query_data(query)
+    assert_query_result(result, status_code, 200, [SUCCESS])
+
+
+def test_invalidate_subscription_cache_non_canonical_user_id():
+    # Test case: "03"-like user IDs share the cache keys of the integer user ID
+    cache = FakeRedis()
+    service = _cached_service(cache)
+    result, status_code = service.execute_query_data(REQUESTS["non_canonical_user_id"])
+    assert_query_result(result, status_code, 200, [SUCCESS])
+    assert list(cache.data) == ["subs:1:1:HOURLY"]
+
+    service.invalidate_subscription_cache(1, 1)
+    assert len(cache.data) == 0
+
+
+def test_invalidate_subscription_cache_error():
+    # Test case: Redis errors on invalidation are logged, not raised
+    service = _cached_service(BrokenRedis())
+    service.invalidate_subscription_cache(1, 1)
+
+
+# =================================================================
+# | -------------------- FULL QUERY FLOW TEST --------------------|
+# =================================================================
+
+
+# ===================== Input validation test =====================
+def test_input_validation_failed_1(service):
+    """
+    Test input validation failed (missing required fields)
+    """
+    query = REQUESTS["input_validation_failed_1"]
+    errors, status_code = service.execute_query_data(query)
+    assert status_code == 400
+    assert "Missing required fields start_time, end_time" in errors
+
+
+def test_input_validation_failed_2(service):
+    """
+    Test input validation failed (missing required fields)
+    """
+    query = REQUESTS["input_validation_failed_2"]
+    errors, status_code = service.execute_query_data(query)
+    assert status_code == 400
+    assert "Missing required fields timing" in errors
+
+
+def test_input_validation_failed_3(service):
+    """
+    Test input validation failed (timing is not 'HOURLY' or 'DAILY')
+    """
+    query = REQUESTS["input_validation_failed_3"]
+    errors, status_code = service.execute_query_data(query)
+    assert status_code == 400
+    assert "Only support 'HOURLY' and 'DAILY' timing." in errors
+
+
+def test_input_validation_failed_4(service):
+    """
+    Test input validation failed (invalid timestamp format)
+    """
+    query = REQUESTS["input_validation_failed_4"]
+    errors, status_code = service.execute_query_data(query)
+    assert status_code == 500
+    assert (
+        "Internal Server Error. Details: invalid literal for int() with base 10: 'Khang'"
+        in errors
+    )
+
+
+def test_input_validation_failed_5(service):
+    """
+    Test input validation failed (user_id is not an integer)
+    """
+    query = REQUESTS["input_validation_failed_5"]
+    errors, status_code = service.execute_query_data(query)
+    assert status_code == 400
+    assert "Invalid user_id, must be an integer." in errors
+
+
+# ============= Subscription type/time range test (all keyword cases) =============
+@pytest.mark.parametrize(
+    "query, expected_status, expected_results",
+    [pytest.param(*case, id=name) for name, *case in CASES],
+)
+def test_flow(service, query, expected_status, expected_results):
+    """
+    Test the query flow of a subscription case in `CASES`, checking the result
+    of each requested keyword.
+    """
+    result, status_code = service.execute_query_data(query)
+    assert_query_result(result, status_code, expected_status, expected_results)
@@ -0,0 +1,23 @@
+import functools
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(path: str = "config.yml") -> dict:
+    """
+    Parse the config file once per process, later calls return the cached config.
+
+    Parameters:
+        path (str): Path of the YAML config file.
+
+    Returns:
+        dict: The parsed config, shared by all callers (do not modify it).
+    """
+    with open(path, encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlLoader)
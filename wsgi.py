@@ -0,0 +1,10 @@
+"""
+WSGI entrypoint for running the Flask app under a production server.
+
+Example:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import app
+
+__all__ = ["app"]